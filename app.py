@@ -1,168 +1,159 @@
-from flask import Flask, render_template, request, jsonify, send_file
-from research_agent import ResearchAgent
-from presentation_generator import PresentationGenerator
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from celery.result import AsyncResult
+from tasks import celery_app, redis_client, job_key, md_key, update_job, run_research
+import json
 import os
-import threading
-from datetime import datetime
-import markdown
+import re
 import secrets
+from urllib.parse import quote
+from datetime import datetime
+import uvicorn
 
-app = Flask(__name__)
-
-# Secure configuration
-app.config.update(
-    SECRET_KEY=os.getenv('SECRET_KEY', secrets.token_hex(32)),
-    DEBUG=os.getenv('FLASK_ENV') != 'production',
-    MAX_CONTENT_LENGTH=16 * 1024 * 1024
-)
-
-# Store research results (in production, use Redis or database)
-research_results = {}
-
-class ResearchThread(threading.Thread):
-    def __init__(self, topic, result_id):
-        threading.Thread.__init__(self)
-        self.topic = topic
-        self.result_id = result_id
-        self.daemon = True
-    
-    def run(self):
-        try:
-            research_agent = ResearchAgent()
-            presentation_gen = PresentationGenerator()
-            
-            # Update progress
-            research_results[self.result_id]['status'] = 'searching'
-            research_results[self.result_id]['message'] = '🔍 Searching for reliable sources...'
-            
-            # Conduct research
-            research_data = research_agent.research_topic(self.topic)
-            
-            # Update progress
-            research_results[self.result_id]['status'] = 'analyzing'
-            research_results[self.result_id]['message'] = '🤖 Analyzing content with AI...'
-            
-            # Generate presentation
-            presentation = presentation_gen.generate_presentation(research_data, self.topic)
-            
-            # Save to file
-            filename = f"research_presentation_{self.result_id}.md"
-            filepath = os.path.join('uploads', filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(presentation)
-            
-            # Convert to HTML for display
-            html_content = markdown.markdown(presentation)
-            
-            research_results[self.result_id] = {
-                'status': 'completed',
-                'topic': self.topic,
-                'presentation': presentation,
-                'html_content': html_content,
-                'filename': filename,
-                'filepath': filepath,
-                'timestamp': datetime.now().isoformat(),
-                'message': '✅ Research completed!'
-            }
-            
-        except Exception as e:
-            research_results[self.result_id] = {
-                'status': 'error',
-                'error': str(e),
-                'timestamp': datetime.now().isoformat(),
-                'message': '❌ Research failed'
-            }
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/research', methods=['POST'])
-def start_research():
-    data = request.get_json()
-    if not data:
-        return jsonify({'error': 'No JSON data provided'}), 400
-    
-    topic = data.get('topic', '').strip()
-    if not topic:
-        return jsonify({'error': 'Topic is required'}), 400
-    
-    if len(topic) > 200:
-        return jsonify({'error': 'Topic too long (max 200 characters)'}), 400
-    
-    # Generate unique ID for this research
-    result_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    
+DEBUG = os.getenv('FLASK_ENV') != 'production'
+
+# Largest request body accepted; a research request only carries a short topic
+MAX_CONTENT_LENGTH = 16 * 1024
+
+# Characters stripped from topics when building download filenames
+_UNSAFE_RE = re.compile(r'[^\w \-]+')
+
+app = FastAPI(title='AI Research Agent', debug=DEBUG)
+app.mount('/static', StaticFiles(directory='static'), name='static')
+templates = Jinja2Templates(directory='templates')
+
+def queue_research(topic, result_id):
     # Initialize research entry
-    research_results[result_id] = {
+    update_job(result_id, {
         'status': 'initializing',
         'topic': topic,
         'timestamp': datetime.now().isoformat(),
         'message': '🚀 Initializing research...'
-    }
-    
-    # Start research in background thread
-    research_thread = ResearchThread(topic, result_id)
-    research_thread.start()
-    
-    return jsonify({
+    })
+
+    # Queue research on a Celery worker
+    run_research.apply_async((topic, result_id), task_id=result_id)
+
+async def read_body(request):
+    """Read the request body, or return None if it exceeds MAX_CONTENT_LENGTH"""
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit() and int(content_length) > MAX_CONTENT_LENGTH:
+        return None
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_CONTENT_LENGTH:
+            return None
+    return bytes(body)
+
+@app.get('/')
+async def index(request: Request):
+    return templates.TemplateResponse('index.html', {'request': request})
+
+@app.post('/research')
+async def start_research(request: Request):
+    body = await read_body(request)
+    if body is None:
+        return JSONResponse({'error': 'Request too large'}, status_code=413)
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if not data or not isinstance(data, dict):
+        return JSONResponse({'error': 'No JSON data provided'}, status_code=400)
+
+    topic = data.get('topic', '').strip()
+    if not topic:
+        return JSONResponse({'error': 'Topic is required'}, status_code=400)
+
+    if len(topic) > 200:
+        return JSONResponse({'error': 'Topic too long (max 200 characters)'}, status_code=400)
+
+    # Generate unique ID for this research (hex, so it passes the isalnum() check)
+    result_id = secrets.token_hex(12)
+
+    # Redis and the broker are blocking clients, keep them off the event loop
+    await run_in_threadpool(queue_research, topic, result_id)
+
+    return {
         'result_id': result_id,
         'status': 'initializing',
         'message': 'Research started successfully!'
-    })
+    }
 
-@app.route('/research/<result_id>')
-def get_research_status(result_id):
+@app.get('/research/{result_id}')
+def get_research_status(result_id: str):
     if not result_id.isalnum() or len(result_id) > 50:
-        return jsonify({'error': 'Invalid research ID'}), 400
-    
-    result = research_results.get(result_id, {})
+        return JSONResponse({'error': 'Invalid research ID'}, status_code=400)
+
+    result = redis_client.hgetall(job_key(result_id))
     if not result:
-        return jsonify({'error': 'Research not found'}), 404
-    
-    return jsonify(result)
+        return JSONResponse({'error': 'Research not found'}, status_code=404)
+
+    # A worker that died mid-task never reports its own failure
+    if result.get('status') not in ('completed', 'error'):
+        if AsyncResult(result_id, app=celery_app).state == 'FAILURE':
+            result.update({'status': 'error', 'error': 'Research worker failed', 'message': '❌ Research failed'})
 
-@app.route('/download/<result_id>')
-def download_presentation(result_id):
+    if result.get('status') == 'completed':
+        result['presentation'] = redis_client.get(md_key(result_id))
+
+    return result
+
+@app.get('/download/{result_id}')
+def download_presentation(result_id: str):
     if not result_id.isalnum() or len(result_id) > 50:
-        return jsonify({'error': 'Invalid research ID'}), 400
-    
-    result = research_results.get(result_id, {})
+        return JSONResponse({'error': 'Invalid research ID'}, status_code=400)
+
+    result = redis_client.hgetall(job_key(result_id))
     if result.get('status') != 'completed':
-        return jsonify({'error': 'Research not completed'}), 400
-    
-    filepath = result.get('filepath')
-    if not filepath or not os.path.exists(filepath):
-        return jsonify({'error': 'File not found'}), 404
-    
-    safe_topic = "".join(c for c in result['topic'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        return JSONResponse({'error': 'Research not completed'}, status_code=400)
+
+    presentation = redis_client.get(md_key(result_id))
+    if presentation is None:
+        return JSONResponse({'error': 'File not found'}, status_code=404)
+
+    safe_topic = _UNSAFE_RE.sub('', result.get('topic', '')).rstrip()
     download_name = f"research_{safe_topic}.md"
-    
-    return send_file(filepath, as_attachment=True, download_name=download_name)
 
-@app.route('/health')
-def health_check():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    return Response(
+        presentation,
+        media_type='text/markdown',
+        headers={'Content-Disposition': f"attachment; filename*=utf-8''{quote(download_name)}"}
+    )
+
+@app.get('/health')
+async def health_check():
+    return {'status': 'healthy', 'timestamp': datetime.now().isoformat()}
 
 # Error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Resource not found'}), 404
+@app.exception_handler(StarletteHTTPException)
+async def http_error(request, error):
+    if error.status_code == 404:
+        return JSONResponse({'error': 'Resource not found'}, status_code=404)
+    return JSONResponse({'error': error.detail}, status_code=error.status_code)
+
+@app.exception_handler(Exception)
+async def internal_error(request, error):
+    return JSONResponse({'error': 'Internal server error'}, status_code=500)
 
-@app.errorhandler(500)
-def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+# Create uploads directory if it doesn't exist
+os.makedirs('uploads', exist_ok=True)
 
 if __name__ == '__main__':
-    # Create uploads directory if it doesn't exist
-    os.makedirs('uploads', exist_ok=True)
-    
     # Get host and port from environment
     host = os.getenv('HOST', '0.0.0.0')
     port = int(os.getenv('PORT', 5000))
-    
+    workers = int(os.getenv('WORKERS', 1))
+
     print(f"🚀 Starting AI Research Agent on {host}:{port}")
     print("📝 Environment:", os.getenv('FLASK_ENV', 'development'))
-    
-    app.run(host=host, port=port, debug=os.getenv('FLASK_ENV') != 'production')
\ No newline at end of file
+
+    # In production run: uvicorn app:app --workers N
+    uvicorn.run('app:app', host=host, port=port, workers=workers, reload=DEBUG and workers == 1)
@@ -1,22 +1,12 @@
-import secrets
-import os
-
 def generate_production_keys():
-    print("🔐 Generating Production Keys...")
+    print("🔐 Generating Production Settings...")
     print("=" * 50)
     
-    # Generate secret key
-    secret_key = secrets.token_hex(32)
-    
-    print("✅ Generated SECRET_KEY:")
-    print(secret_key)
-    print()
-    
     # Update .env file
-    env_content = f"""# Production Environment Variables
+    env_content = """# Production Environment Variables
 OPENAI_API_KEY=your_actual_openai_key_here
 FLASK_ENV=production
-SECRET_KEY={secret_key}
+REDIS_URL=redis://localhost:6379/0
 
 # Research Configuration
 RESEARCH_SOURCES=3
@@ -30,8 +20,10 @@ MAX_CONTENT_LENGTH=2500
     print()
     print("📝 Next steps:")
     print("1. Replace 'your_actual_openai_key_here' with your real OpenAI API key")
-    print("2. Your Flask app is now production-ready!")
-    print("3. Never commit .env to version control")
+    print("2. Point REDIS_URL at your Redis server")
+    print("3. Start the app with: uvicorn app:app --workers N")
+    print("4. Start a worker with: celery -A tasks worker --pool=prefork --loglevel=info")
+    print("5. Never commit .env to version control")
 
 if __name__ == "__main__":
     generate_production_keys()
\ No newline at end of file
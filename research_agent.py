@@ -1,22 +1,176 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
 from duckduckgo_search import DDGS
-from openai import OpenAI
+from openai import AsyncOpenAI
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+import asyncio
+import codecs
+import hashlib
 import json
-import time
 import os
 import re
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# selectolax (Lexbor) is much faster than BeautifulSoup; lxml-backed bs4 is the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Pages are cut to 2500 characters of text, so there is no need to download more than this
+MAX_HTML_BYTES = 256 * 1024
+
+_WS_RE = re.compile(r'\s+')
+
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.I)
+
+# Split on sentence-ending punctuation followed by whitespace, so decimals and URLs stay intact
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Keyword analysis matches at word starts so inflections like "advances" or "challenges" still count
+def _keyword_re(keywords):
+    return re.compile(r'\b(?:' + '|'.join(keywords) + r')', re.I)
+
+_KEY_POINT_RE = _keyword_re(['breakthrough', 'advance', 'discovery', 'innovation', 'developed', 'created', 'achieved', 'successful'])
+_CHALLENGE_RE = _keyword_re(['challenge', 'limitation', 'problem', 'issue', 'difficult', 'hard', 'bottleneck', 'constraint'])
+_FUTURE_RE = _keyword_re(['future', 'outlook', 'prediction', 'trend', 'will', 'expected', 'potential', 'prospect'])
+
+UNWANTED_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside']
+
+# Common main-content containers, in order of preference
+CONTENT_SELECTORS = [
+    'main', 'article',
+    '[role="main"]', '.content', '.main', '.article',
+    '.post-content', '.entry-content', '.story-content'
+]
+
+RELIABLE_DOMAINS = frozenset([
+    'wikipedia.org', 'arxiv.org', 'nature.com', 'science.org',
+    'technologyreview.com', 'ieee.org', 'acm.org', 'nist.gov',
+    'mit.edu', 'stanford.edu', 'researchgate.net', 'springer.com',
+    'sciencedirect.com', 'towardsdatascience.com', 'techcrunch.com',
+    'medium.com', 'github.com', 'stackoverflow.com'
+])
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# LLM analyses are reused for a day
+ANALYSIS_CACHE_TTL = 24 * 60 * 60
+
+# Search results are reused for an hour
+SEARCH_CACHE_TTL = 60 * 60
+
+# Seconds to wait for DuckDuckGo before falling back to default sources
+SEARCH_TIMEOUT = 20
+
+# Shared Redis client for cached analyses
+_cache = None
+_cache_loop = None
+
+# Shared HTTP session so connections (DNS, TCP, TLS) are reused across fetches
+_session = None
+_session_loop = None
+
+def _get_session():
+    """Return the shared aiohttp session for the running event loop"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            headers={'User-Agent': USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=15),
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=8)
+        )
+        _session_loop = loop
+    return _session
+
+def _get_cache():
+    """Return the shared Redis client for the running event loop"""
+    global _cache, _cache_loop
+    loop = asyncio.get_running_loop()
+    if _cache is None or _cache_loop is not loop:
+        _cache = aioredis.from_url(REDIS_URL, decode_responses=True)
+        _cache_loop = loop
+    return _cache
+
+async def _cache_get(key):
+    """Read a cached value, treating an unreachable Redis as a cache miss"""
+    try:
+        return await _get_cache().get(key)
+    except RedisError as e:
+        print(f"   ⚠️  Cache read failed: {e}")
+        return None
+
+async def _cache_set(key, value, ttl):
+    """Store a value in the cache, ignoring Redis failures"""
+    try:
+        await _get_cache().set(key, value, ex=ttl)
+    except RedisError as e:
+        print(f"   ⚠️  Cache write failed: {e}")
+
+def _empty_research_data():
+    """Fresh result dict for a single research call"""
+    return {
+        'key_points': [],
+        'recent_developments': [],
+        'challenges': [],
+        'future_outlook': [],
+        'sources': []
+    }
+
+def _decode_html(body, charset=None, truncated=False):
+    """Decode HTML bytes using the declared charset, replacing undecodable bytes"""
+    # The Content-Type header wins; otherwise look for <meta charset> near the top of the page
+    if not charset:
+        match = _META_CHARSET_RE.search(body, 0, 4096)
+        charset = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        charset = 'utf-8'
+    if truncated:
+        # A body cut at MAX_HTML_BYTES can end mid-character; leave that incomplete tail out
+        return codecs.getincrementaldecoder(charset)('replace').decode(body, final=False)
+    return body.decode(charset, errors='replace')
+
+def _html_to_text(html):
+    """Return the visible text of the page's main content"""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for node in tree.css(','.join(UNWANTED_TAGS)):
+            node.decompose()
+        main_content = None
+        for selector in CONTENT_SELECTORS:
+            main_content = tree.css_first(selector)
+            if main_content is not None:
+                break
+        # Fallback to body
+        if main_content is None:
+            main_content = tree.body if tree.body is not None else tree.root
+        return main_content.text(separator=' ') if main_content is not None else ''
+
+    soup = BeautifulSoup(html, 'lxml')
+    for script in soup(UNWANTED_TAGS):
+        script.decompose()
+    main_content = None
+    for selector in CONTENT_SELECTORS:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    # Fallback to body
+    return (main_content or soup).get_text(separator=' ')
+
+def parse_html(html):
+    """Extract cleaned main-content text from decoded HTML"""
+    # Collapse whitespace in a single pass and keep the first 2500 characters
+    return _WS_RE.sub(' ', _html_to_text(html))[:2500].strip()
 
 class ResearchAgent:
     def __init__(self):
-        self.sources = []
-        self.research_data = {
-            'key_points': [],
-            'recent_developments': [],
-            'challenges': [],
-            'future_outlook': [],
-            'sources': []
-        }
         self.setup_openai()
     
     def setup_openai(self):
@@ -24,7 +178,7 @@ class ResearchAgent:
         api_key = os.getenv('OPENAI_API_KEY')
         if api_key:
             try:
-                self.client = OpenAI(api_key=api_key)
+                self.client = AsyncOpenAI(api_key=api_key)
                 self.client_available = True
                 print("✅ OpenAI client initialized")
             except Exception as e:
@@ -34,27 +188,28 @@ class ResearchAgent:
             self.client_available = False
             print("⚠️  OpenAI API key not found. Using basic analysis.")
     
-    def research_topic(self, topic, num_sources=3):
+    async def research_topic(self, topic, num_sources=3):
         """Enhanced research with OpenAI analysis"""
         try:
             print(f"🌐 Searching for sources about: {topic}")
-            sources = self._search_web(topic, num_sources)
+            sources = await self._search_web(topic, num_sources)
             
             if not sources:
                 print("❌ No reliable sources found. Using demonstration data.")
                 return self._get_mock_research_data(topic)
             
             print(f"📚 Found {len(sources)} sources. Extracting content...")
-            all_content = []
-            for i, url in enumerate(sources, 1):
-                print(f"   📖 Reading source {i}/{len(sources)}: {self._shorten_url(url)}")
-                content = self._extract_content(url)
-                if content:
-                    all_content.append({
-                        'content': content,
-                        'source': url
-                    })
-                time.sleep(1)  # Be polite to servers
+            # Fetch all sources concurrently, one request at a time per host
+            host_limits = defaultdict(lambda: asyncio.Semaphore(1))
+            contents = await asyncio.gather(
+                *[self._polite_extract(url, host_limits) for url in sources],
+                return_exceptions=True
+            )
+            all_content = [
+                {'content': content, 'source': url}
+                for url, content in zip(sources, contents)
+                if content and not isinstance(content, BaseException)
+            ]
             
             if not all_content:
                 print("❌ Could not extract content from sources. Using demonstration data.")
@@ -63,20 +218,22 @@ class ResearchAgent:
             # Analyze all content with OpenAI
             if self.client_available and all_content:
                 print("🤖 Analyzing content with AI...")
-                self.research_data = self._analyze_with_openai(all_content, topic)
+                research_data = await self._analyze_with_openai(all_content, topic)
             else:
                 print("🔍 Analyzing content with basic analysis...")
+                research_data = _empty_research_data()
                 for item in all_content:
-                    self._keyword_analysis(item['content'], item['source'])
+                    self._keyword_analysis(item['content'], research_data)
+                research_data['sources'] = self._unique_sources(all_content)
             
             print("✅ Research completed successfully!")
-            return self.research_data
+            return research_data
             
         except Exception as e:
             print(f"❌ Research error: {e}")
             return self._get_mock_research_data(topic)
     
-    def _analyze_with_openai(self, content_list, topic):
+    async def _analyze_with_openai(self, content_list, topic):
         """Use OpenAI to analyze and synthesize research"""
         try:
             # Prepare content for analysis
@@ -85,46 +242,49 @@ class ResearchAgent:
                 for item in content_list
             ])
             
-            prompt = f"""
-            Analyze the following research content about {topic} and extract structured information.
+            # Identical topic + content gives an identical analysis, so skip the LLM on re-runs
+            cache_key = "analysis:" + hashlib.blake2b(
+                f"{topic}\n{combined_content}".encode('utf-8'), digest_size=16
+            ).hexdigest()
+            analysis = await _cache_get(cache_key)
+            cached = analysis is not None
             
-            RESEARCH CONTENT:
-            {combined_content}
-            
-            Please provide a JSON response with the following structure:
-            {{
-                "key_points": ["list 3-5 key findings"],
-                "recent_developments": ["list 2-3 recent advancements"], 
-                "challenges": ["list 2-3 main challenges"],
-                "future_outlook": ["list 2-3 future predictions"],
-                "sources": {[item['source'] for item in content_list]}
-            }}
-            
-            Be concise and factual. Focus on the most important information.
-            Return only valid JSON, no additional text.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a research analyst that extracts structured information from technical content. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-            
-            # Parse the JSON response
-            analysis = response.choices[0].message.content.strip()
-            
-            # Clean the response
-            if analysis.startswith('```json'):
-                analysis = analysis[7:]
-            if analysis.endswith('```'):
-                analysis = analysis[:-3]
-            analysis = analysis.strip()
+            if not cached:
+                prompt = f"""
+                Analyze this research content about {topic}.
+                
+                RESEARCH CONTENT:
+                {combined_content}
+                
+                Respond with a JSON object with these keys:
+                {{
+                    "key_points": ["3-5 key findings"],
+                    "recent_developments": ["2-3 recent advancements"],
+                    "challenges": ["2-3 main challenges"],
+                    "future_outlook": ["2-3 future predictions"]
+                }}
+                
+                Be concise and factual.
+                """
+                
+                response = await self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a research analyst that extracts structured information from technical content. Always return valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.3,
+                    max_tokens=1500
+                )
+                analysis = response.choices[0].message.content
             
-            return json.loads(analysis)
+            research_data = json.loads(analysis)
+            if not cached:
+                await _cache_set(cache_key, analysis, ANALYSIS_CACHE_TTL)
+            # Sources are known already, no need to spend tokens on the model repeating them
+            research_data['sources'] = self._unique_sources(content_list)
+            return research_data
             
         except json.JSONDecodeError as e:
             print(f"   ❌ Failed to parse AI response as JSON: {e}")
@@ -133,18 +293,26 @@ class ResearchAgent:
             print(f"   ❌ OpenAI analysis failed: {e}")
             return self._fallback_analysis(content_list)
     
-    def _search_web(self, topic, num_sources):
+    async def _search_web(self, topic, num_sources):
         """Search for relevant sources using DuckDuckGo"""
         try:
+            # Search results for a topic rarely change within the hour
+            cache_key = f"search:{num_sources}:" + hashlib.blake2b(
+                topic.lower().encode('utf-8'), digest_size=16
+            ).hexdigest()
+            cached = await _cache_get(cache_key)
+            if cached is not None:
+                print("   ⚡ Using cached search results")
+                return json.loads(cached)
+            
             print("   🔎 Searching DuckDuckGo...")
-            ddgs = DDGS()
             search_query = f"{topic} technology research 2024"
             sources = []
 
-            results = ddgs.text(
-                keywords=search_query, 
-                max_results=num_sources + 2,
-                region='wt-wt'
+            # DDGS is blocking, so keep it off the event loop and bound how long we wait
+            results = await asyncio.wait_for(
+                asyncio.to_thread(self._ddgs_text, search_query, num_sources + 2),
+                timeout=SEARCH_TIMEOUT
             )
             
             for result in results:
@@ -155,83 +323,79 @@ class ResearchAgent:
                     if len(sources) >= num_sources:
                         break
             
-            return sources if sources else self._get_mock_sources(topic)
+            if not sources:
+                return self._get_mock_sources(topic)
+            
+            await _cache_set(cache_key, json.dumps(sources), SEARCH_CACHE_TTL)
+            return sources
             
         except Exception as e:
             print(f"   ❌ Search error: {e}")
             return self._get_mock_sources(topic)
     
+    def _ddgs_text(self, search_query, max_results):
+        """Run a blocking DuckDuckGo text search"""
+        ddgs = DDGS()
+        return list(ddgs.text(
+            keywords=search_query,
+            max_results=max_results,
+            region='wt-wt'
+        ))
+    
     def _shorten_url(self, url):
         """Shorten URL for display"""
         return url[:50] + "..." if len(url) > 50 else url
     
     def _is_reliable_source(self, url):
         """Check if source is from reliable domains"""
-        reliable_domains = [
-            'wikipedia.org', 'arxiv.org', 'nature.com', 'science.org',
-            'technologyreview.com', 'ieee.org', 'acm.org', 'nist.gov',
-            'mit.edu', 'stanford.edu', 'researchgate.net', 'springer.com',
-            'sciencedirect.com', 'towardsdatascience.com', 'techcrunch.com',
-            'medium.com', 'github.com', 'stackoverflow.com'
-        ]
-        return any(domain in url.lower() for domain in reliable_domains)
+        # Match the host and each parent domain, e.g. en.wikipedia.org -> wikipedia.org
+        labels = (urlsplit(url).hostname or '').split('.')
+        return any('.'.join(labels[i:]) in RELIABLE_DOMAINS for i in range(len(labels) - 1))
     
-    def _extract_content(self, url):
+    async def _extract_content(self, url):
         """Extract content from webpage"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            html = await self._fetch_html(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Parse in a thread so the event loop keeps serving other fetches; the Celery
+            # prefork worker already gives each job its own process, so no extra pool is needed
+            text = await asyncio.to_thread(parse_html, html)
             
-            # Remove unwanted tags
-            for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                script.decompose()
-            
-            # Try to get main content from common content containers
-            content_selectors = [
-                'main', 'article', 
-                '[role="main"]', '.content', '.main', '.article',
-                '.post-content', '.entry-content', '.story-content'
-            ]
-            
-            main_content = None
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            if main_content:
-                text = main_content.get_text()
-            else:
-                # Fallback to body
-                text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Remove excessive whitespace
-            text = re.sub(r'\s+', ' ', text)
-            
-            return text[:2500].strip() if text else None
+            return text or None
             
         except Exception as e:
             print(f"   ❌ Error extracting content from {url}: {e}")
             return None
     
+    async def _fetch_html(self, url):
+        """Download up to MAX_HTML_BYTES of a webpage and decode it to text"""
+        # Stream the body and stop once we have enough HTML to work with
+        chunks = []
+        total = 0
+        truncated = False
+        async with _get_session().get(url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= MAX_HTML_BYTES:
+                    truncated = True
+                    break
+            charset = response.charset
+        # Both parsers get str, so pages that are not UTF-8 are not lost
+        return _decode_html(b''.join(chunks)[:MAX_HTML_BYTES], charset, truncated)
+    
+    async def _polite_extract(self, url, host_limits):
+        """Extract content while holding the per-host politeness slot"""
+        async with host_limits[urlsplit(url).hostname]:
+            print(f"   📖 Reading source: {self._shorten_url(url)}")
+            return await self._extract_content(url)
+    
     def _fallback_analysis(self, content_list):
         """Fallback analysis when AI fails"""
-        research_data = {
-            'key_points': [], 'recent_developments': [], 
-            'challenges': [], 'future_outlook': [], 'sources': []
-        }
+        research_data = _empty_research_data()
         for item in content_list:
-            self._keyword_analysis(item['content'], item['source'], research_data)
+            self._keyword_analysis(item['content'], research_data)
         
         # Ensure we have some data
         if not research_data['key_points']:
@@ -241,44 +405,33 @@ class ResearchAgent:
         if not research_data['future_outlook']:
             research_data['future_outlook'] = ["Promising future developments expected"]
         
-        research_data['sources'] = [item['source'] for item in content_list]
+        research_data['sources'] = self._unique_sources(content_list)
         return research_data
     
-    def _keyword_analysis(self, content, source_url, research_data=None):
+    def _unique_sources(self, content_list):
+        """Source URLs of the analysed content, deduplicated in order"""
+        return list(dict.fromkeys(item['source'] for item in content_list))
+    
+    def _keyword_analysis(self, content, research_data):
         """Fallback keyword analysis"""
-        if research_data is None:
-            research_data = self.research_data
-            
-        content_lower = content.lower()
-        sentences = content.split('.')
-
-        key_point_keywords = ['breakthrough', 'advance', 'discovery', 'innovation', 'developed', 'created', 'achieved', 'successful']
-        challenge_keywords = ['challenge', 'limitation', 'problem', 'issue', 'difficult', 'hard', 'bottleneck', 'constraint']
-        future_keywords = ['future', 'outlook', 'prediction', 'trend', 'will', 'expected', 'potential', 'prospect']
-        
-        for sentence in sentences:
+        for sentence in _SENTENCE_END_RE.split(content):
             clean_sentence = sentence.strip()
             if len(clean_sentence) > 30 and len(clean_sentence) < 300:
-                sentence_lower = clean_sentence.lower()
-                
-                if any(keyword in sentence_lower for keyword in key_point_keywords):
+                if _KEY_POINT_RE.search(clean_sentence):
                     research_data['key_points'].append(clean_sentence[:250])
                 
-                if any(keyword in sentence_lower for keyword in challenge_keywords):
+                if _CHALLENGE_RE.search(clean_sentence):
                     research_data['challenges'].append(clean_sentence[:250])
                 
-                if any(keyword in sentence_lower for keyword in future_keywords):
+                if _FUTURE_RE.search(clean_sentence):
                     research_data['future_outlook'].append(clean_sentence[:250])
         
         # Use recent_developments as a copy of key_points for basic analysis
         research_data['recent_developments'] = research_data['key_points'][:2] if research_data['key_points'] else ["Recent developments in the field"]
         
-        if source_url not in research_data['sources']:
-            research_data['sources'].append(source_url)
-        
         # Limit to reasonable numbers
         for key in ['key_points', 'challenges', 'future_outlook']:
-            research_data[key] = list(set(research_data[key]))[:4]  # Remove duplicates, max 4
+            research_data[key] = list(dict.fromkeys(research_data[key]))[:4]  # Remove duplicates in order, max 4
     
     def _get_mock_sources(self, topic):
         """Get mock sources for demonstration"""
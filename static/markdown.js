@@ -0,0 +1,81 @@
+// Minimal markdown renderer for generated presentations.
+// Covers what PresentationGenerator emits: headings, rules, ordered and
+// unordered lists, paragraphs, bold, italics, inline code and bare links.
+// Input is HTML-escaped before any markup is added, so the output is safe
+// to assign to innerHTML.
+
+function escapeMarkdownHtml(text) {
+    return text
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#039;');
+}
+
+function renderInline(text) {
+    return escapeMarkdownHtml(text)
+        .replace(/`([^`]+)`/g, '<code>$1</code>')
+        .replace(/\*\*([^*]+)\*\*/g, '<strong>$1</strong>')
+        .replace(/\*([^*]+)\*/g, '<em>$1</em>')
+        .replace(/(https?:\/\/[^\s<]+)/g, '<a href="$1" target="_blank" rel="noopener noreferrer">$1</a>');
+}
+
+function renderMarkdown(markdownText) {
+    const html = [];
+    let paragraph = [];
+    let listType = null;
+
+    const closeParagraph = () => {
+        if (paragraph.length) {
+            html.push(`<p>${renderInline(paragraph.join(' '))}</p>`);
+            paragraph = [];
+        }
+    };
+    const closeList = () => {
+        if (listType) {
+            html.push(`</${listType}>`);
+            listType = null;
+        }
+    };
+    const openList = (type) => {
+        closeParagraph();
+        if (listType !== type) {
+            closeList();
+            html.push(`<${type}>`);
+            listType = type;
+        }
+    };
+
+    for (const rawLine of markdownText.split(/\r?\n/)) {
+        const line = rawLine.trim();
+        let match;
+
+        if (!line) {
+            closeParagraph();
+            closeList();
+        } else if ((match = line.match(/^(#{1,6})\s+(.*)$/))) {
+            closeParagraph();
+            closeList();
+            const level = match[1].length;
+            html.push(`<h${level}>${renderInline(match[2])}</h${level}>`);
+        } else if (/^(-{3,}|\*{3,})$/.test(line)) {
+            closeParagraph();
+            closeList();
+            html.push('<hr>');
+        } else if ((match = line.match(/^\d+\.\s+(.*)$/))) {
+            openList('ol');
+            html.push(`<li>${renderInline(match[1])}</li>`);
+        } else if ((match = line.match(/^[-*]\s+(.*)$/))) {
+            openList('ul');
+            html.push(`<li>${renderInline(match[1])}</li>`);
+        } else {
+            closeList();
+            paragraph.push(line);
+        }
+    }
+
+    closeParagraph();
+    closeList();
+    return html.join('\n');
+}
@@ -161,9 +161,9 @@ class ResearchApp {
         researchResults.style.display = 'block';
         researchResults.innerHTML = `
             <div class="presentation-result">
-                <h3>Research Complete: ${this.escapeHtml(data.topic)}</h3>
+                <h3>Research Complete: ${this.escapeHtml(data.topic || '')}</h3>
                 <div class="presentation-content">
-                    ${data.html_content}
+                    ${this.renderPresentation(data.presentation || '')}
                 </div>
                 <a href="/download/${this.currentResearchId}" class="download-btn">
                     📥 Download Presentation
@@ -227,6 +227,14 @@ class ResearchApp {
         }, 5000);
     }
 
+    renderPresentation(markdownText) {
+        // renderMarkdown comes from markdown.js; fall back to the plain markdown if it failed to load
+        if (typeof renderMarkdown === 'function') {
+            return renderMarkdown(markdownText);
+        }
+        return `<pre class="presentation-plain">${this.escapeHtml(markdownText)}</pre>`;
+    }
+
     escapeHtml(unsafe) {
         return unsafe
             .replace(/&/g, "&amp;")
@@ -0,0 +1,117 @@
+from celery import Celery
+from research_agent import ResearchAgent
+from presentation_generator import PresentationGenerator
+import asyncio
+import os
+from datetime import datetime
+import redis
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Start a worker with: celery -A tasks worker --pool=prefork --loglevel=info
+# The prefork pool (Celery's default) is required: each child runs one job at a time on its
+# own event loop, so the shared HTTP session and agent below are never used concurrently.
+celery_app = Celery('research', broker=REDIS_URL, backend=REDIS_URL)
+
+# Research progress is kept in a Redis hash so every web worker sees the same state
+redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+
+# Finished jobs are dropped from Redis after an hour
+JOB_TTL = 60 * 60
+
+# Write presentations to disk in 64KB blocks
+WRITE_BUFFER_SIZE = 1 << 16
+
+def job_key(result_id):
+    """Redis key holding the progress fields of a research job"""
+    return f"job:{result_id}"
+
+def md_key(result_id):
+    """Redis key holding the markdown presentation of a research job"""
+    return f"job:{result_id}:md"
+
+def update_job(result_id, fields, presentation=None):
+    """Merge progress fields (and optionally the presentation) into a job in one transaction"""
+    key = job_key(result_id)
+    with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, JOB_TTL)
+        if presentation is not None:
+            pipe.set(md_key(result_id), presentation, ex=JOB_TTL)
+        pipe.execute()
+
+# Shared per worker process so the OpenAI client and its connection pool are reused across jobs.
+# Created on first use so web processes that import this module never build them.
+_research_agent = None
+_presentation_gen = None
+
+def _get_research_agent():
+    """Return this worker process's ResearchAgent, creating it on first use"""
+    global _research_agent
+    if _research_agent is None:
+        _research_agent = ResearchAgent()
+    return _research_agent
+
+def _get_presentation_gen():
+    """Return this worker process's PresentationGenerator, creating it on first use"""
+    global _presentation_gen
+    if _presentation_gen is None:
+        _presentation_gen = PresentationGenerator()
+    return _presentation_gen
+
+# Long-lived event loop per worker process so pooled HTTP connections outlive a single job
+_loop = None
+
+def _run_async(coro):
+    """Run a coroutine on this worker process's event loop"""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+@celery_app.task
+def run_research(topic, result_id):
+    try:
+        # Update progress
+        update_job(result_id, {
+            'status': 'searching',
+            'message': '🔍 Searching for reliable sources...'
+        })
+
+        # Conduct research
+        research_data = _run_async(_get_research_agent().research_topic(topic))
+
+        # Update progress
+        update_job(result_id, {
+            'status': 'analyzing',
+            'message': '🤖 Analyzing content with AI...'
+        })
+
+        # Generate presentation
+        presentation = _get_presentation_gen().generate_presentation(research_data, topic)
+
+        # Save to file
+        filename = f"research_presentation_{result_id}.md"
+        filepath = os.path.join('uploads', filename)
+
+        os.makedirs('uploads', exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(presentation)
+
+        # Topic is rewritten so the job is complete even if its hash expired while queued
+        update_job(result_id, {
+            'status': 'completed',
+            'topic': topic,
+            'filename': filename,
+            'timestamp': datetime.now().isoformat(),
+            'message': '✅ Research completed!'
+        }, presentation=presentation)
+
+    except Exception as e:
+        update_job(result_id, {
+            'status': 'error',
+            'topic': topic,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat(),
+            'message': '❌ Research failed'
+        })